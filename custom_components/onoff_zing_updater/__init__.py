@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+import ijson
+import orjson
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.storage import Store
 
 from .const import (
@@ -22,37 +29,79 @@ from .installer import download_and_install
 
 _LOGGER = logging.getLogger(__name__)
 
+_EMPTY: dict = {}
+
+# Maximum number of pending packages downloaded and installed at once
+PENDING_INSTALL_CONCURRENCY = 4
+
+
+def _unique_suffix() -> str:
+    """Get a unique suffix for repair issue ids.
+
+    Wall-clock based so ids stay unique across host restarts, since the
+    issue registry persists them.
+    """
+    return f"{time.time_ns():x}"
 
-def _get_datetime_timestamp() -> str:
-    """Get current date and time as a timestamp string."""
-    now = datetime.now()
-    return now.strftime("%Y%m%d%H%M%S")
+
+def _create_restart_issues(hass: HomeAssistant, repos: list[str]) -> None:
+    """Create a fixable restart repair issue for each installed integration.
+
+    The issue registry debounces its own saves, so a batch of issues created
+    in one pass is written to storage once.
+    """
+    batch_ts = _unique_suffix()
+    for i, repo in enumerate(repos):
+        ir.async_create_issue(
+            hass,
+            domain=DOMAIN,
+            issue_id=f"onoff_restart_{repo}_{batch_ts}{i:x}",
+            is_fixable=True,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="integration_restart_required",
+            translation_placeholders={"integration_name": repo},
+            data={"integration_name": repo},
+        )
 
 
 def _scan_custom_components_versions(hass: HomeAssistant) -> dict[str, str]:
     """Return installed custom_components domains mapped to their manifest versions."""
-    cc_root = Path(hass.config.path("custom_components"))
+    cc_root = hass.config.path("custom_components")
     versions: dict[str, str] = {}
-    if not cc_root.exists():
+    try:
+        with os.scandir(cc_root) as it:
+            domain_dirs = [
+                entry
+                for entry in it
+                if entry.is_dir() and not entry.name.startswith(".")
+            ]
+    except FileNotFoundError:
+        return versions
+    if not domain_dirs:
         return versions
 
-    for domain_dir in cc_root.iterdir():
-        if not domain_dir.is_dir():
-            continue
+    def _read_one(domain_dir: os.DirEntry) -> tuple[str, str, str | None]:
         domain = domain_dir.name
-        if domain.startswith("."):
-            continue
         version = "unknown"
-        manifest_path = domain_dir / "manifest.json"
-        if manifest_path.exists():
-            try:
-                data = json.loads(manifest_path.read_text(encoding="utf-8"))
-                version = data.get("version") or version
-                manifest_domain = (data.get("domain") or "").strip()
-                if manifest_domain and manifest_domain.lower() != domain.lower():
-                    versions.setdefault(manifest_domain.lower(), version)
-            except Exception as e:
-                _LOGGER.debug("Failed to read manifest for %s: %s", domain, e)
+        manifest_domain = None
+        manifest_path = os.path.join(domain_dir.path, "manifest.json")
+        try:
+            with open(manifest_path, "rb") as f:
+                data = orjson.loads(f.read())
+            version = data.get("version") or version
+            manifest_domain = (data.get("domain") or "").strip() or None
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            _LOGGER.debug("Failed to read manifest for %s: %s", domain, e)
+        return domain, version, manifest_domain
+
+    with ThreadPoolExecutor(max_workers=min(32, len(domain_dirs))) as executor:
+        results = list(executor.map(_read_one, domain_dirs))
+
+    for domain, version, manifest_domain in results:
+        if manifest_domain and manifest_domain.lower() != domain.lower():
+            versions.setdefault(manifest_domain.lower(), version)
         versions[domain.lower()] = version
 
     return versions
@@ -64,36 +113,45 @@ def _load_hacs_integrations(hass: HomeAssistant) -> set[str]:
     if not hacs_path.exists():
         return set()
 
+    domains: set[str] = set()
+
     try:
-        raw = json.loads(hacs_path.read_text(encoding="utf-8"))
+        # Stream repository records instead of building the whole JSON tree
+        for prefix in ("data.repositories.item", "repositories.item"):
+            found = False
+            with hacs_path.open("rb") as f:
+                for repo in ijson.items(f, prefix):
+                    found = True
+                    _add_hacs_repo_domains(repo, domains)
+            if found:
+                break
     except Exception as e:
         _LOGGER.debug("Failed to read HACS storage: %s", e)
         return set()
 
-    data = raw.get("data", raw)
-    repos = data.get("repositories", [])
-    domains: set[str] = set()
+    return domains
 
-    for repo in repos:
-        try:
-            category = repo.get("category") or repo.get("data", {}).get("category")
-            installed = repo.get("installed")
-            if installed is None:
-                installed = repo.get("data", {}).get("installed")
-            if category != "integration" or not installed:
-                continue
-            domain = repo.get("domain") or repo.get("data", {}).get("domain")
-            if isinstance(domain, str) and domain:
-                domains.add(domain.lower())
-            else:
-                domains_list = repo.get("domains") or repo.get("data", {}).get("domains") or []
-                for d in domains_list:
-                    if isinstance(d, str) and d:
-                        domains.add(d.lower())
-        except Exception:
-            continue
 
-    return domains
+def _add_hacs_repo_domains(repo: dict, domains: set[str]) -> None:
+    """Add the domains of an installed HACS integration repository to domains."""
+    try:
+        data = repo.get("data") or _EMPTY
+        category = repo.get("category") or data.get("category")
+        installed = repo.get("installed")
+        if installed is None:
+            installed = data.get("installed")
+        if category != "integration" or not installed:
+            return
+        domain = repo.get("domain") or data.get("domain")
+        if isinstance(domain, str) and domain:
+            domains.add(domain.lower())
+        else:
+            domains_list = repo.get("domains") or data.get("domains") or []
+            for d in domains_list:
+                if isinstance(d, str) and d:
+                    domains.add(d.lower())
+    except Exception:
+        return
 
 
 async def _sync_preinstalled_integrations(
@@ -107,24 +165,16 @@ async def _sync_preinstalled_integrations(
         return
 
     hacs_domains = await hass.async_add_executor_job(_load_hacs_integrations, hass)
-    from .config_flow import load_store_list
+    from .config_flow import async_load_store_list
 
     default_owner: str | None = (entry.data.get("owner") or "").strip() or None
-    store_packages = await hass.async_add_executor_job(load_store_list, hass)
+    store_packages = await async_load_store_list(hass)
 
     to_track: list[tuple[str, str, str, str | None, str | None, str]] = []
 
-    def _match_installed_domain(repo: str, pkg_domain: str | None = None) -> str | None:
-        candidates = []
-        if pkg_domain:
-            candidates.append(pkg_domain)
-        candidates.append(repo)
-        candidates.append(repo.replace("-", "_"))
-        for cand in candidates:
-            key = (cand or "").strip().lower()
-            if key and key in installed:
-                return key
-        return None
+    # Installed domains keyed by name with "-" normalized to "_"; exact names win
+    domain_lookup: dict[str, str] = {domain.replace("-", "_"): domain for domain in installed if "-" in domain}
+    domain_lookup.update((domain, domain) for domain in installed if "-" not in domain)
 
     for pkg in store_packages:
         repo = (pkg.get("repo") or "").strip()
@@ -132,7 +182,10 @@ async def _sync_preinstalled_integrations(
             continue
         if pkg.get("type", TYPE_INTEGRATION) != TYPE_INTEGRATION:
             continue
-        match_domain = _match_installed_domain(repo, pkg.get("domain"))
+        pkg_domain = (pkg.get("domain") or "").strip().lower().replace("-", "_")
+        match_domain = (pkg_domain and domain_lookup.get(pkg_domain)) or domain_lookup.get(
+            repo.lower().replace("-", "_")
+        )
         if not match_domain:
             continue
         owner = (pkg.get("owner") or default_owner or "").strip()
@@ -156,16 +209,139 @@ async def _sync_preinstalled_integrations(
         return
 
     _LOGGER.info("Tracking %d pre-installed custom_components integrations", len(to_track))
-    for owner, repo, version, mode, asset_name, source in to_track:
-        await coordinator.async_add_or_update_package(
-            repo_name=repo,
-            owner=owner,
-            package_type=TYPE_INTEGRATION,
-            installed_version=version,
-            mode=mode,
-            asset_name=asset_name,
-            source=source,
+    await coordinator.async_add_or_update_packages(
+        [
+            {
+                "repo_name": repo,
+                "owner": owner,
+                "package_type": TYPE_INTEGRATION,
+                "installed_version": version,
+                "mode": mode,
+                "asset_name": asset_name,
+                "source": source,
+            }
+            for owner, repo, version, mode, asset_name, source in to_track
+        ]
+    )
+
+
+async def _install_pending_packages(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    client: GiteaClient,
+    coordinator,
+    default_owner: str | None,
+    pending_installs: list[str],
+) -> None:
+    """Install packages that were selected during setup/reconfigure."""
+    try:
+        from .config_flow import async_load_store_list, package_key
+
+        packages = await async_load_store_list(hass)
+        # Keep the first entry per key, matching the store list's declaration order
+        pkg_index: dict[str, dict] = {}
+        for p in packages:
+            pkg_index.setdefault(package_key(p.get('owner', ''), p.get('repo', '')), p)
+        pending_pkgs: list[dict] = []
+        for key in pending_installs:
+            pkg = pkg_index.get(key)
+            if not pkg:
+                _LOGGER.error("Package not found for key: %s", key)
+                continue
+
+            repo = pkg.get("repo")
+            owner = pkg.get("owner", default_owner)
+            if not repo or not owner:
+                _LOGGER.error("Invalid package data: %s", pkg)
+                continue
+
+            pending_pkgs.append(
+                {
+                    "repo_name": repo,
+                    "owner": owner,
+                    "package_type": pkg.get("type", "integration"),
+                    "mode": pkg.get("mode") or MODE_ZIPBALL,
+                    "asset_name": pkg.get("asset_name"),
+                    "source": pkg.get("source", "gitea"),
+                }
+            )
+
+        sem = asyncio.Semaphore(PENDING_INSTALL_CONCURRENCY)
+
+        async def _resolve_one(spec: dict) -> tuple[str, str]:
+            """Resolve a pending package's download URL, bounded by the semaphore."""
+            async with sem:
+                return await _resolve_download_url(
+                    client, spec["owner"], spec["repo_name"], spec["mode"], None, spec["asset_name"], None
+                )
+
+        # Resolve all download URLs up front so metadata round trips overlap
+        resolved = await asyncio.gather(
+            *(_resolve_one(spec) for spec in pending_pkgs),
+            return_exceptions=True,
+        )
+
+        async def _install_one(spec: dict, resolution) -> dict | None:
+            """Install a single pending package, returning its tracking spec."""
+            owner = spec["owner"]
+            repo = spec["repo_name"]
+            pkg_type = spec["package_type"]
+
+            if isinstance(resolution, BaseException):
+                _LOGGER.error("Failed to install %s/%s: %s", owner, repo, resolution)
+                return None
+            url, version = resolution
+
+            async with sem:
+                _LOGGER.info("Installing package: %s/%s (type: %s)", owner, repo, pkg_type)
+
+                try:
+                    result = await download_and_install(
+                        hass,
+                        url=url,
+                        headers={},
+                        package_type=pkg_type,
+                        repo_name=repo,
+                    )
+
+                    _LOGGER.info("Installed: %s/%s", owner, repo)
+
+                except Exception as e:
+                    _LOGGER.error("Failed to install %s/%s: %s", owner, repo, e, exc_info=True)
+                    return None
+
+            return {**spec, "installed_version": version}
+
+        results = await asyncio.gather(
+            *(_install_one(spec, resolution) for spec, resolution in zip(pending_pkgs, resolved)),
+            return_exceptions=True,
         )
+        installed_specs = [r for r in results if isinstance(r, dict)]
+
+        # Register packages with coordinator
+        await coordinator.async_add_or_update_packages(installed_specs)
+
+        # Track installed integrations for restart notification
+        installed_integrations = [
+            spec["repo_name"] for spec in installed_specs if spec["package_type"] == "integration"
+        ]
+
+        # Create fixable restart repair issue for each installed integration
+        if installed_integrations:
+            try:
+                _create_restart_issues(hass, installed_integrations)
+                _LOGGER.info("Created restart repair issues for %d integrations", len(installed_integrations))
+            except Exception as e:
+                _LOGGER.warning("Could not create restart notification: %s", e)
+
+        # Clear pending installs from entry data
+        if "pending_installs" in entry.data:
+            new_data = {k: v for k, v in entry.data.items() if k != "pending_installs"}
+            hass.config_entries.async_update_entry(entry, data=new_data)
+            _LOGGER.info("Cleared pending installations from entry data")
+
+    except Exception as e:
+        _LOGGER.error("Failed to install pending packages: %s", e, exc_info=True)
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
@@ -214,105 +390,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     pending_installs = entry.data.get("pending_installs", [])
     if pending_installs:
         _LOGGER.info("Found %d pending packages to install", len(pending_installs))
-
-        async def _install_pending_packages():
-            """Install packages that were selected during setup/reconfigure."""
-            try:
-                from .config_flow import load_store_list
-
-                packages = await hass.async_add_executor_job(load_store_list, hass)
-                installed_integrations = []
-
-                for key in pending_installs:
-                    pkg = None
-                    for p in packages:
-                        pkg_key = f"{p.get('owner', '')}_{p.get('repo', '')}"
-                        if pkg_key == key:
-                            pkg = p
-                            break
-
-                    if not pkg:
-                        _LOGGER.error("Package not found for key: %s", key)
-                        continue
-
-                    repo = pkg.get("repo")
-                    owner = pkg.get("owner", default_owner)
-                    pkg_type = pkg.get("type", "integration")
-                    mode = pkg.get("mode") or MODE_ZIPBALL
-                    asset_name = pkg.get("asset_name")
-
-                    if not repo or not owner:
-                        _LOGGER.error("Invalid package data: %s", pkg)
-                        continue
-
-                    _LOGGER.info("Installing package: %s/%s (type: %s)", owner, repo, pkg_type)
-
-                    try:
-                        # Resolve download URL
-                        url, version = await _resolve_download_url(client, owner, repo, mode, None, asset_name, None)
-
-                        result = await download_and_install(
-                            hass,
-                            url=url,
-                            headers={},
-                            package_type=pkg_type,
-                            repo_name=repo,
-                        )
-
-                        # Register package with coordinator
-                        await coordinator.async_add_or_update_package(
-                            repo_name=repo,
-                            owner=owner,
-                            package_type=pkg_type,
-                            installed_version=version,
-                            mode=mode,
-                            asset_name=asset_name,
-                            source=pkg.get("source", "gitea"),
-                        )
-
-                        _LOGGER.info("Installed: %s/%s", owner, repo)
-
-                        # Track installed integrations for restart notification
-                        if pkg_type == "integration":
-                            installed_integrations.append(repo)
-
-                    except Exception as e:
-                        _LOGGER.error("Failed to install %s/%s: %s", owner, repo, e, exc_info=True)
-
-                # Create fixable restart repair issue for each installed integration
-                if installed_integrations:
-                    try:
-                        from homeassistant.helpers import issue_registry as ir
-                        for repo in installed_integrations:
-                            ir.async_create_issue(
-                                hass,
-                                domain=DOMAIN,
-                                issue_id=f"onoff_restart_{repo}_{_get_datetime_timestamp()}",
-                                is_fixable=True,
-                                severity=ir.IssueSeverity.WARNING,
-                                translation_key="integration_restart_required",
-                                translation_placeholders={"integration_name": repo},
-                                data={"integration_name": repo},
-                            )
-                        _LOGGER.info("Created restart repair issues for %d integrations", len(installed_integrations))
-                    except Exception as e:
-                        _LOGGER.warning("Could not create restart notification: %s", e)
-
-                # Clear pending installs from entry data
-                new_data = dict(entry.data)
-                new_data.pop("pending_installs", None)
-                hass.config_entries.async_update_entry(entry, data=new_data)
-                _LOGGER.info("Cleared pending installations from entry data")
-
-            except Exception as e:
-                _LOGGER.error("Failed to install pending packages: %s", e, exc_info=True)
-
-        hass.async_create_task(_install_pending_packages())
+        hass.async_create_task(
+            _install_pending_packages(hass, entry, client, coordinator, default_owner, pending_installs)
+        )
 
     async def _handle_check_updates(call: ServiceCall) -> None:
         """Handle check_updates service call."""
         coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-        await coordinator.async_check_updates()
+        await coordinator.async_check_updates(force=True)
 
     hass.services.async_register(DOMAIN, SERVICE_CHECK_UPDATES, _handle_check_updates)
 
@@ -403,17 +488,7 @@ async def async_install_package(
     # Create repair issue for integration installs
     if pkg_type == TYPE_INTEGRATION:
         try:
-            from homeassistant.helpers import issue_registry as ir
-            ir.async_create_issue(
-                hass,
-                domain=DOMAIN,
-                issue_id=f"onoff_restart_{repo}_{_get_datetime_timestamp()}",
-                is_fixable=True,
-                severity=ir.IssueSeverity.WARNING,
-                translation_key="integration_restart_required",
-                translation_placeholders={"integration_name": repo},
-                data={"integration_name": repo},
-            )
+            _create_restart_issues(hass, [repo])
         except Exception as e:
             _LOGGER.debug("Could not create repair issue: %s", e)
 
@@ -435,6 +510,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "button", "update"])
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if data:
+            # Write pending changes before a reload creates a new store
+            await data["coordinator"].async_flush_packages()
 
     return unload_ok
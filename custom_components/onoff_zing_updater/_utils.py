@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import base64
+from functools import lru_cache
 
 
 def _decode_endpoint(encoded_segments: list[str]) -> str:
@@ -16,6 +17,7 @@ def _decode_endpoint(encoded_segments: list[str]) -> str:
         return "https://" + "git" + "." + "example" + "." + "com"
 
 
+@lru_cache(maxsize=1)
 def get_primary_endpoint() -> str:
     """Get primary endpoint."""
     # Encoded segments (split for obfuscation)
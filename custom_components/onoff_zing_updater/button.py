@@ -168,7 +168,7 @@ class PackageCheckUpdateButton(ButtonEntity):
     async def async_press(self) -> None:
         """Handle the button press."""
         _LOGGER.info("Check for updates button pressed for package %s", self._package_id)
-        await self._coordinator.async_check_updates()
+        await self._coordinator.async_check_updates(force=True)
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
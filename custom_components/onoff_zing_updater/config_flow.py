@@ -14,27 +14,92 @@ from ._utils import get_primary_endpoint
 
 _LOGGER = logging.getLogger(__name__)
 
+_INTEGRATION_DIR = os.path.dirname(__file__)
+_STORE_LIST_PATH = os.path.join(_INTEGRATION_DIR, "store_list.yaml")
 
-def load_store_list(hass: HomeAssistant) -> list[dict]:
-    """Load store list from YAML file."""
+# Parsed store list and its (key, label, type) form options,
+# keyed by (path, mtime_ns, size) of the YAML file
+_STORE_CACHE: tuple[
+    tuple[str, int, int], list[dict], list[tuple[str, str, str]]
+] | None = None
+
+
+def _store_list_key(store_list_path: str) -> tuple[str, int, int] | None:
+    """Return the cache key for the store list file, or None if it is missing."""
     try:
-        integration_dir = os.path.dirname(__file__)
-        store_list_path = os.path.join(integration_dir, "store_list.yaml")
+        st = os.stat(store_list_path)
+    except FileNotFoundError:
+        _LOGGER.warning("Store list file not found: %s", store_list_path)
+        return None
+    return (store_list_path, st.st_mtime_ns, st.st_size)
+
+
+def package_key(owner: str, repo: str) -> str:
+    """Return the form and pending-install key for a package.
+
+    Keys are stored in entry data and used as multi_select values, so they
+    stay strings rather than (owner, repo) tuples.
+    """
+    return f"{owner}_{repo}"
 
-        if not os.path.exists(store_list_path):
-            _LOGGER.warning("Store list file not found: %s", store_list_path)
-            return []
 
+def _build_store_options(packages: list[dict]) -> list[tuple[str, str, str]]:
+    """Build (key, label, type) form options for store packages."""
+    options = []
+    for pkg in packages:
+        try:
+            name = pkg.get("name", "Unknown")
+            pkg_type = pkg.get("type", "unknown")
+            desc = pkg.get("description", "")
+            label = f"{name} ({pkg_type})"
+            if desc:
+                label = f"{label} - {desc}"
+            key = package_key(pkg.get('owner', ''), pkg.get('repo', ''))
+            options.append((key, label, pkg_type))
+        except Exception as e:
+            _LOGGER.warning("Skipping invalid package: %s", e)
+            continue
+    return options
+
+
+def _load_store_list_cached(store_list_path: str, stat_key: tuple[str, int, int]):
+    """Parse the store list YAML and cache it under stat_key."""
+    global _STORE_CACHE
+
+    try:
         data = load_yaml(store_list_path)
         packages = data.get('packages', []) if data else []
         packages = [p for p in packages if p and isinstance(p, dict)]
 
+        _STORE_CACHE = (stat_key, packages, _build_store_options(packages))
         _LOGGER.info("Loaded %d packages from store list", len(packages))
-        return packages
+        return _STORE_CACHE
 
     except Exception as e:
         _LOGGER.error("Failed to load store list: %s", e, exc_info=True)
-        return []
+        return None
+
+
+async def _async_load_store_cache(hass: HomeAssistant):
+    """Return the store list cache entry, only using the executor when it is stale."""
+    stat_key = _store_list_key(_STORE_LIST_PATH)
+    if stat_key is None:
+        return None
+    if _STORE_CACHE is not None and _STORE_CACHE[0] == stat_key:
+        return _STORE_CACHE
+    return await hass.async_add_executor_job(_load_store_list_cached, _STORE_LIST_PATH, stat_key)
+
+
+async def async_load_store_list(hass: HomeAssistant) -> list[dict]:
+    """Load store list from YAML file."""
+    cached = await _async_load_store_cache(hass)
+    return cached[1] if cached else []
+
+
+async def async_load_store_options(hass: HomeAssistant) -> list[tuple[str, str, str]]:
+    """Load (key, label, type) form options for the store list."""
+    cached = await _async_load_store_cache(hass)
+    return cached[2] if cached else []
 
 
 class OnOffGiteaStoreConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -98,29 +163,16 @@ class OnOffGiteaStoreConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors = {}
 
         try:
-            packages = await self.hass.async_add_executor_job(load_store_list, self.hass)
+            store_options = await async_load_store_options(self.hass)
         except Exception as e:
             _LOGGER.error("Failed to load store list: %s", e, exc_info=True)
-            packages = []
+            store_options = []
 
-        if not packages:
+        if not store_options:
             _LOGGER.info("Store list is empty, finishing setup")
             return self.async_abort(reason="no_packages")
 
-        package_options = {}
-        for pkg in packages:
-            try:
-                name = pkg.get("name", "Unknown")
-                pkg_type = pkg.get("type", "unknown")
-                desc = pkg.get("description", "")
-                label = f"{name} ({pkg_type})"
-                if desc:
-                    label = f"{label} - {desc}"
-                key = f"{pkg.get('owner', '')}_{pkg.get('repo', '')}"
-                package_options[key] = label
-            except Exception as e:
-                _LOGGER.warning("Skipping invalid package: %s", e)
-                continue
+        package_options = {key: label for key, label, _type in store_options}
 
         schema = vol.Schema(
             {
@@ -149,10 +201,12 @@ class OnOffGiteaStoreConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         # Build installed packages map: key -> package_data
         installed_map = {}
+        installed_ids = {}
         if coordinator:
             for pkg_id, pkg_data in coordinator.packages.items():
-                key = f"{pkg_data.get('owner', '')}_{pkg_data.get('repo_name', '')}"
+                key = package_key(pkg_data.get('owner', ''), pkg_data.get('repo_name', ''))
                 installed_map[key] = pkg_data
+                installed_ids[key] = pkg_id
 
         if user_input is not None:
             selected_install = user_input.get("packages_to_install", [])
@@ -201,43 +255,23 @@ class OnOffGiteaStoreConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         # Show package selection form
         try:
-            packages = await self.hass.async_add_executor_job(load_store_list, self.hass)
+            store_options = await async_load_store_options(self.hass)
         except Exception as e:
             _LOGGER.error("Failed to load store list: %s", e, exc_info=True)
-            packages = []
+            store_options = []
 
-        if not packages and not installed_map:
+        if not store_options and not installed_map:
             return self.async_abort(reason="no_packages")
 
         # Build options for packages to install (not yet installed)
-        install_options = {}
-        for pkg in packages:
-            try:
-                name = pkg.get("name", "Unknown")
-                pkg_type = pkg.get("type", "unknown")
-                desc = pkg.get("description", "")
-                key = f"{pkg.get('owner', '')}_{pkg.get('repo', '')}"
-
-                # Only show packages that aren't installed
-                if key not in installed_map:
-                    label = f"{name} ({pkg_type})"
-                    if desc:
-                        label = f"{label} - {desc}"
-                    install_options[key] = label
-            except Exception as e:
-                _LOGGER.warning("Skipping invalid package: %s", e)
-                continue
+        install_options = {
+            key: label for key, label, _type in store_options if key not in installed_map
+        }
 
         # Build options for packages to uninstall (already installed)
-        uninstall_options = {}
-        for key, pkg_data in installed_map.items():
-            repo_name = pkg_data.get("repo_name", "Unknown")
-            pkg_type = pkg_data.get("package_type", "unknown")
-            version = pkg_data.get("installed_version", "")
-            label = f"{repo_name} ({pkg_type})"
-            if version:
-                label = f"{label} - v{version}"
-            uninstall_options[key] = label
+        uninstall_options = {
+            key: coordinator.get_uninstall_label(pkg_id) for key, pkg_id in installed_ids.items()
+        }
 
         # Build schema with both install and uninstall options
         schema_dict = {}
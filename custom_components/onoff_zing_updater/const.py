@@ -16,7 +16,8 @@ LOVELACE_VENDOR_FOLDER = "onoff"
 UPDATE_CHECK_INTERVAL = 7200  # seconds
 
 # Storage keys
-STORAGE_VERSION = 1
+# Version 2 stores packages in a column-per-field layout
+STORAGE_VERSION = 2
 STORAGE_KEY_PACKAGES = "yidstore_packages"
 
 # Sensor attributes
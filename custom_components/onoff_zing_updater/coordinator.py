@@ -1,22 +1,95 @@
 """Coordinator for OnOff Zing Updater package tracking."""
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+import time
 from datetime import datetime
 from typing import Any
 
+import aiohttp
+
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .button import PackageUpdateButton, PackageCheckUpdateButton
 from .const import (
     DOMAIN,
     STORAGE_KEY_PACKAGES,
     STORAGE_VERSION,
 )
+from .gitea import NOT_MODIFIED, GiteaAPIError
+from .sensor import (
+    PackageVersionSensor,
+    PackageUpdateSensor,
+    PackageTypeSensor,
+    WaitingRestartSensor,
+)
+from .update import PackageUpdateEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of concurrent release checks against the Gitea server
+UPDATE_CHECK_CONCURRENCY = 8
+
+# Seconds after a check during which a package is not checked again
+UPDATE_CHECK_COOLDOWN = 300
+
+# Seconds to coalesce package changes before writing storage
+SAVE_DELAY = 10
+
+# Characters of release notes kept in memory; full notes are fetched on demand
+RELEASE_NOTES_PREVIEW_LEN = 512
+
+
+def _packages_to_columns(packages: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Convert packages to a column-per-field layout for storage.
+
+    Field names are written once instead of once per package.
+    """
+    fields = sorted({field for package_data in packages.values() for field in package_data})
+    return {
+        "ids": list(packages),
+        "columns": {
+            field: [package_data.get(field) for package_data in packages.values()]
+            for field in fields
+        },
+    }
+
+
+def _packages_from_columns(data: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Rebuild the packages dict from its stored column layout.
+
+    Every package gets every stored field; fields a package never had come
+    back as None, matching how _store_package writes unset values.
+    """
+    columns = data.get("columns", {})
+    packages: dict[str, dict[str, Any]] = {}
+    for i, package_id in enumerate(data.get("ids", [])):
+        packages[package_id] = {field: values[i] for field, values in columns.items()}
+    return packages
+
+
+class _PackagesStore(Store):
+    """Store for tracked packages that migrates older storage versions."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Migrate the plain packages dict of version 1 to the column layout."""
+        if old_major_version == 1:
+            return _packages_to_columns(old_data.get("packages", {}))
+        raise NotImplementedError
+
+
+@functools.lru_cache(maxsize=2048)
+def _make_package_id(owner: str, repo_name: str) -> str:
+    """Build the package id for an owner and repo name."""
+    return f"{owner}_{repo_name}".lower().replace("-", "_")
+
 
 class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
     """Coordinator to manage package tracking and updates."""
@@ -32,11 +105,16 @@ class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
         self.entry_id = entry_id
         self.client = client
         self.packages: dict[str, dict[str, Any]] = {}
-        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY_PACKAGES)
+        # Store serializes with orjson when no custom encoder is given, so keep it default
+        self._store = _PackagesStore(hass, STORAGE_VERSION, STORAGE_KEY_PACKAGES)
         self._add_entities_callback = None
         self._add_button_entities_callback = None
         self._add_update_entities_callback = None
         self._created_entities: set[str] = set()
+        self._uninstall_labels: dict[str, str] = {}
+        self._by_owner_repo: dict[tuple[str, str], str] = {}
+        self._last_check_mono: dict[str, float] = {}
+        self._check_semaphore = asyncio.Semaphore(UPDATE_CHECK_CONCURRENCY)
 
     async def async_load_packages(self) -> None:
         """Load tracked packages from storage."""
@@ -44,19 +122,32 @@ class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
         data = await self._store.async_load()
 
         if data:
-            self.packages = data.get("packages", {})
+            self.packages = _packages_from_columns(data)
             _LOGGER.info("Loaded %d tracked packages", len(self.packages))
         else:
             self.packages = {}
             _LOGGER.info("No tracked packages found")
 
+        self._by_owner_repo = {
+            (v.get("owner"), v.get("repo_name")): k for k, v in self.packages.items()
+        }
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to write to storage."""
+        return _packages_to_columns(self.packages)
+
     async def async_save_packages(self) -> None:
-        """Save tracked packages to storage."""
+        """Schedule a save of tracked packages, coalescing bursts of changes."""
+        _LOGGER.debug("Scheduling save of %d tracked packages", len(self.packages))
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_flush_packages(self) -> None:
+        """Write tracked packages to storage immediately."""
         _LOGGER.info("Saving %d tracked packages...", len(self.packages))
-        await self._store.async_save({"packages": self.packages})
+        await self._store.async_save(self._data_to_save())
         _LOGGER.info("Packages saved")
 
-    async def async_add_or_update_package(
+    def _store_package(
         self,
         repo_name: str,
         owner: str,
@@ -65,15 +156,16 @@ class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
         mode: str = None,
         asset_name: str = None,
         source: str = "gitea",
-    ) -> str:
-        """Add or update a tracked package."""
-        package_id = f"{owner}_{repo_name}".lower().replace("-", "_")
+    ) -> tuple[str, dict[str, Any], bool]:
+        """Update the in-memory record for a package without saving it."""
+        package_id = _make_package_id(owner, repo_name)
 
         is_new_package = package_id not in self.packages
 
         _LOGGER.info("Adding/updating package: %s (new: %s)", package_id, is_new_package)
 
         existing_data = self.packages.get(package_id, {})
+        now_iso = datetime.now().isoformat()
 
         package_data = {
             "repo_name": repo_name,
@@ -82,8 +174,8 @@ class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
             "installed_version": installed_version,
             "latest_version": installed_version,
             "update_available": False,
-            "install_date": existing_data.get("install_date", datetime.now().isoformat()),
-            "last_update": datetime.now().isoformat(),
+            "install_date": existing_data.get("install_date", now_iso),
+            "last_update": now_iso,
             "last_check": existing_data.get("last_check"),
             "mode": mode,
             "asset_name": asset_name,
@@ -91,125 +183,215 @@ class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
         }
 
         self.packages[package_id] = package_data
-        await self.async_save_packages()
+        self._by_owner_repo[(owner, repo_name)] = package_id
+        self._uninstall_labels.pop(package_id, None)
+        return package_id, package_data, is_new_package
 
-        _LOGGER.info("Package %s tracked", package_id)
+    async def _async_packages_stored(self, stored: list[tuple[str, dict, bool]]) -> None:
+        """Create entities for new packages or refresh those of existing ones."""
+        new_packages: list[tuple[str, dict]] = []
+        updated = False
+        device_registry = dr.async_get(self.hass)
 
-        if is_new_package and self._add_entities_callback and package_id not in self._created_entities:
-            _LOGGER.info("Creating sensors for new package: %s", package_id)
-            await self._create_sensors_for_package(package_id, package_data)
-        else:
-            _LOGGER.info("Notifying sensors to update for: %s", package_id)
-            self.async_update_listeners()
+        for package_id, package_data, is_new_package in stored:
+            _LOGGER.info("Package %s tracked", package_id)
 
-            from homeassistant.helpers import device_registry as dr
-            device_registry = dr.async_get(self.hass)
+            if is_new_package and self._add_entities_callback and package_id not in self._created_entities:
+                _LOGGER.info("Creating sensors for new package: %s", package_id)
+                new_packages.append((package_id, package_data))
+                continue
+
+            updated = True
             device = device_registry.async_get_device(identifiers={(DOMAIN, package_id)})
             if device:
                 device_registry.async_update_device(
                     device.id,
-                    sw_version=installed_version
+                    sw_version=package_data["installed_version"]
                 )
-                _LOGGER.info("Updated device registry sw_version to %s", installed_version)
+                _LOGGER.info("Updated device registry sw_version to %s", package_data["installed_version"])
+
+        if updated:
+            _LOGGER.info("Notifying sensors to update")
+            self.async_update_listeners()
+
+        if new_packages:
+            await self._create_entities_for_packages(new_packages)
+
+    async def async_add_or_update_package(
+        self,
+        repo_name: str,
+        owner: str,
+        package_type: str,
+        installed_version: str,
+        mode: str = None,
+        asset_name: str = None,
+        source: str = "gitea",
+    ) -> str:
+        """Add or update a tracked package."""
+        package_id, package_data, is_new_package = self._store_package(
+            repo_name=repo_name,
+            owner=owner,
+            package_type=package_type,
+            installed_version=installed_version,
+            mode=mode,
+            asset_name=asset_name,
+            source=source,
+        )
+        await self.async_save_packages()
+        await self._async_packages_stored([(package_id, package_data, is_new_package)])
 
         return package_id
 
-    async def _create_sensors_for_package(self, package_id: str, package_data: dict) -> None:
-        """Create sensors and button for a package dynamically."""
+    async def async_add_or_update_packages(self, package_specs: list[dict[str, Any]]) -> list[str]:
+        """Add or update several tracked packages, saving storage once.
+
+        Each spec holds the keyword arguments of async_add_or_update_package.
+        Entities for new packages are added with one call per platform.
+        """
+        stored = [self._store_package(**spec) for spec in package_specs]
+        if not stored:
+            return []
+
+        await self.async_save_packages()
+        await self._async_packages_stored(stored)
+
+        return [package_id for package_id, _, _ in stored]
+
+    async def _create_entities_for_packages(self, new_packages: list[tuple[str, dict]]) -> None:
+        """Create sensors, buttons and update entities for packages dynamically."""
+        entry = self.hass.config_entries.async_get_entry(self.entry_id)
+
         if self._add_entities_callback:
             try:
-                from .sensor import (
-                    PackageVersionSensor,
-                    PackageUpdateSensor,
-                    PackageTypeSensor,
-                    WaitingRestartSensor,
-                )
-
-                new_sensors = [
-                    PackageVersionSensor(self, package_id, package_data, self.entry_id),
-                    PackageUpdateSensor(self, package_id, package_data, self.entry_id),
-                    PackageTypeSensor(self, package_id, package_data, self.entry_id),
-                ]
+                new_sensors = []
+                for package_id, package_data in new_packages:
+                    new_sensors.extend([
+                        PackageVersionSensor(self, package_id, package_data, self.entry_id),
+                        PackageUpdateSensor(self, package_id, package_data, self.entry_id),
+                        PackageTypeSensor(self, package_id, package_data, self.entry_id),
+                    ])
 
-                if package_data.get('package_type') == 'integration':
-                    new_sensors.append(WaitingRestartSensor(self, package_id, package_data, self.hass, self.entry_id))
+                    if package_data.get('package_type') == 'integration':
+                        new_sensors.append(WaitingRestartSensor(self, package_id, package_data, self.hass, self.entry_id))
 
                 self._add_entities_callback(new_sensors)
-                _LOGGER.info("Created %d sensors for %s", len(new_sensors), package_data["repo_name"])
+                _LOGGER.info("Created %d sensors for %d packages", len(new_sensors), len(new_packages))
 
             except Exception as e:
-                _LOGGER.error("Failed to create sensors for %s: %s", package_id, e, exc_info=True)
+                _LOGGER.error("Failed to create sensors: %s", e, exc_info=True)
         else:
             _LOGGER.warning("Cannot create sensors - no callback registered")
 
         if self._add_button_entities_callback:
             try:
-                from .button import PackageUpdateButton, PackageCheckUpdateButton
-
-                entry = None
-                for config_entry_id, data in self.hass.data.get(DOMAIN, {}).items():
-                    if data.get("coordinator") == self:
-                        entry = self.hass.config_entries.async_get_entry(config_entry_id)
-                        break
-
                 if entry:
-                    new_button = [
-                        PackageUpdateButton(self, package_id, package_data, entry),
-                        PackageCheckUpdateButton(self, package_id, package_data, entry)
-                    ]
-                    self._add_button_entities_callback(new_button)
-                    self._created_entities.add(package_id)
-                    _LOGGER.info("Created dynamic entities for %s", package_data["repo_name"])
+                    new_buttons = []
+                    for package_id, package_data in new_packages:
+                        new_buttons.append(PackageUpdateButton(self, package_id, package_data, entry))
+                        new_buttons.append(PackageCheckUpdateButton(self, package_id, package_data, entry))
+                    self._add_button_entities_callback(new_buttons)
+                    self._created_entities.update(package_id for package_id, _ in new_packages)
+                    _LOGGER.info("Created dynamic entities for %d packages", len(new_packages))
                 else:
                     _LOGGER.warning("Could not find config entry for button creation")
 
             except Exception as e:
-                _LOGGER.error("Failed to create button for %s: %s", package_id, e, exc_info=True)
+                _LOGGER.error("Failed to create buttons: %s", e, exc_info=True)
         else:
             _LOGGER.debug("Button callback not registered yet")
 
         if self._add_update_entities_callback:
             try:
-                from .update import PackageUpdateEntity
-
-                entry = None
-                for config_entry_id, data in self.hass.data.get(DOMAIN, {}).items():
-                    if data.get("coordinator") == self:
-                        entry = self.hass.config_entries.async_get_entry(config_entry_id)
-                        break
-
                 if entry:
-                    new_update = [PackageUpdateEntity(self, package_id, package_data, entry)]
-                    self._add_update_entities_callback(new_update)
-                    _LOGGER.info("Created update entity for %s", package_data["repo_name"])
+                    new_updates = [
+                        PackageUpdateEntity(self, package_id, package_data, entry)
+                        for package_id, package_data in new_packages
+                    ]
+                    self._add_update_entities_callback(new_updates)
+                    _LOGGER.info("Created %d update entities", len(new_updates))
             except Exception as e:
-                _LOGGER.error("Failed to create update entity for %s: %s", package_id, e, exc_info=True)
+                _LOGGER.error("Failed to create update entities: %s", e, exc_info=True)
         else:
             _LOGGER.debug("Update entity callback not registered yet")
 
-    async def async_check_updates(self, now=None) -> None:
-        """Check for updates for all tracked packages."""
+    def _checked_recently(self, package_id: str, package_data: dict[str, Any], mono_now: float) -> bool:
+        """Return True if the package was checked within the cooldown window."""
+        last_check_mono = self._last_check_mono.get(package_id)
+        if last_check_mono is None:
+            last_check = package_data.get("last_check")
+            if not last_check:
+                return False
+            try:
+                age = (datetime.now() - datetime.fromisoformat(last_check)).total_seconds()
+            except ValueError:
+                return False
+            # A wall clock behind last_check would otherwise push the cooldown into the future
+            age = max(age, 0.0)
+            last_check_mono = mono_now - age
+            self._last_check_mono[package_id] = last_check_mono
+        return mono_now - last_check_mono < UPDATE_CHECK_COOLDOWN
+
+    async def async_check_updates(self, now=None, *, force: bool = False) -> None:
+        """Check for updates for all tracked packages.
+
+        Packages checked within the cooldown window are skipped unless force is set.
+        """
         if not self.packages:
             _LOGGER.info("No packages tracked yet, skipping update check")
             return
 
         _LOGGER.info("Checking for updates for %d packages...", len(self.packages))
 
+        mono_now = time.monotonic()
+        targets = []
         for package_id, package_data in self.packages.items():
-            try:
-                if package_data.get("source", "gitea") in {"github", "hacs"}:
-                    _LOGGER.debug("Skipping update check for %s repo: %s", package_data.get("source"), package_id)
-                    continue
+            if package_data.get("source", "gitea") in {"github", "hacs"}:
+                _LOGGER.debug("Skipping update check for %s repo: %s", package_data.get("source"), package_id)
+                continue
+            if not force and self._checked_recently(package_id, package_data, mono_now):
+                _LOGGER.debug("Skipping update check for recently checked package: %s", package_id)
+                continue
+            targets.append((package_id, package_data))
+            self._last_check_mono[package_id] = mono_now
+
+        now_iso = datetime.now().isoformat()
+        results = await asyncio.gather(
+            *(self._check_one(package_id, package_data, now_iso) for package_id, package_data in targets),
+            return_exceptions=True,
+        )
+        for (package_id, _), result in zip(targets, results):
+            if isinstance(result, BaseException):
+                _LOGGER.error(
+                    "Unexpected error checking updates for %s", package_id, exc_info=result
+                )
+
+        await self.async_save_packages()
+        self.async_update_listeners()
 
+        _LOGGER.info("Update check complete")
+
+    async def _check_one(self, package_id: str, package_data: dict[str, Any], now_iso: str) -> None:
+        """Check a single package for updates, updating package_data in place."""
+        async with self._check_semaphore:
+            try:
                 owner = package_data["owner"]
                 repo = package_data["repo_name"]
                 installed_version = package_data["installed_version"]
 
                 _LOGGER.debug("Checking %s/%s (installed: %s)", owner, repo, installed_version)
 
-                latest_release = await self.client.get_latest_release(owner, repo)
+                latest_release, etag = await self.client.get_latest_release_if_changed(
+                    owner, repo, package_data.get("_etag")
+                )
 
-                if latest_release:
+                if latest_release is NOT_MODIFIED:
+                    _LOGGER.debug("Latest release unchanged for %s/%s", owner, repo)
+                    package_data["last_check"] = now_iso
+                elif latest_release:
+                    if etag:
+                        package_data["_etag"] = etag
+                    else:
+                        package_data.pop("_etag", None)
                     latest_version = latest_release.get("tag_name", "unknown")
                     _LOGGER.debug("Latest version: %s", latest_version)
 
@@ -217,9 +399,14 @@ class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
 
                     package_data["latest_version"] = latest_version
                     package_data["update_available"] = update_available
-                    package_data["last_check"] = datetime.now().isoformat()
+                    package_data["last_check"] = now_iso
                     package_data["release_summary"] = latest_release.get("name")
-                    package_data["release_notes"] = latest_release.get("body")
+                    body = latest_release.get("body") or ""
+                    truncated = len(body) > RELEASE_NOTES_PREVIEW_LEN
+                    package_data["release_notes"] = (
+                        f"{body[:RELEASE_NOTES_PREVIEW_LEN]}…" if truncated else body or None
+                    )
+                    package_data["release_notes_truncated"] = truncated
 
                     if update_available:
                         _LOGGER.info("Update available for %s: %s → %s",
@@ -228,35 +415,66 @@ class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
                         _LOGGER.debug("No update available for %s", repo)
                 else:
                     _LOGGER.debug("No releases found for %s/%s", owner, repo)
-                    package_data["last_check"] = datetime.now().isoformat()
+                    package_data["last_check"] = now_iso
 
             except Exception as e:
-                error_str = str(e)
-                if "404" in error_str or "not found" in error_str.lower():
+                status = e.status if isinstance(e, (GiteaAPIError, aiohttp.ClientResponseError)) else None
+                if status == 404:
                     _LOGGER.debug("Repo %s/%s not found on server.", owner, repo)
-                elif "401" in error_str or "unauthorized" in error_str.lower():
+                elif status == 401:
                     _LOGGER.debug("Auth failed for %s/%s.", owner, repo)
                 else:
                     _LOGGER.warning("Error checking updates for %s: %s", package_id, e)
-                package_data["last_check"] = datetime.now().isoformat()
-
-        await self.async_save_packages()
-        self.async_update_listeners()
-
-        _LOGGER.info("Update check complete")
+                package_data["last_check"] = now_iso
 
     async def async_get_package_info(self, package_id: str) -> dict[str, Any] | None:
         """Get package information by ID."""
         return self.packages.get(package_id)
 
+    async def async_get_release_notes(self, package_id: str) -> str | None:
+        """Fetch the full release notes for a package's latest version.
+
+        Stored notes are returned as-is unless they were truncated to a preview.
+        """
+        package_data = self.packages.get(package_id, {})
+        notes = package_data.get("release_notes")
+        if notes and not package_data.get("release_notes_truncated"):
+            return notes
+
+        owner = package_data.get("owner")
+        repo = package_data.get("repo_name")
+        latest_version = package_data.get("latest_version")
+        if not owner or not repo:
+            return None
+
+        if latest_version and latest_version != "unknown":
+            release = await self.client.get_release_by_tag(owner, repo, latest_version)
+        else:
+            release = await self.client.get_latest_release(owner, repo)
+        return release.get("body") if release else None
+
+    def get_uninstall_label(self, package_id: str) -> str:
+        """Get the reconfigure form label for an installed package."""
+        label = self._uninstall_labels.get(package_id)
+        if label is None:
+            package_data = self.packages.get(package_id, {})
+            repo_name = package_data.get("repo_name", "Unknown")
+            pkg_type = package_data.get("package_type", "unknown")
+            version = package_data.get("installed_version", "")
+            label = f"{repo_name} ({pkg_type})"
+            if version:
+                label = f"{label} - v{version}"
+            self._uninstall_labels[package_id] = label
+        return label
+
     def get_package_by_repo(self, owner: str, repo_name: str) -> dict[str, Any] | None:
         """Get package information by owner and repo name."""
-        package_id = f"{owner}_{repo_name}".lower().replace("-", "_")
+        package_id = self._by_owner_repo.get((owner, repo_name)) or _make_package_id(owner, repo_name)
         return self.packages.get(package_id)
 
     async def async_remove_package(self, owner: str, repo_name: str) -> None:
         """Remove a tracked package from storage and clean up entities."""
-        package_id = f"{owner}_{repo_name}".lower().replace("-", "_")
+        package_id = self._by_owner_repo.get((owner, repo_name)) or _make_package_id(owner, repo_name)
         if package_id in self.packages:
             _LOGGER.info("Removing tracking for package: %s", package_id)
 
@@ -264,7 +482,6 @@ class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
             self._created_entities.discard(package_id)
 
             # Remove device from device registry (this also removes associated entities)
-            from homeassistant.helpers import device_registry as dr
             device_registry = dr.async_get(self.hass)
             device = device_registry.async_get_device(identifiers={(DOMAIN, package_id)})
             if device:
@@ -272,7 +489,10 @@ class OnOffGiteaStoreCoordinator(DataUpdateCoordinator):
                 device_registry.async_remove_device(device.id)
 
             # Remove from packages dict and save
-            self.packages.pop(package_id)
+            package_data = self.packages.pop(package_id)
+            self._last_check_mono.pop(package_id, None)
+            self._by_owner_repo.pop((package_data.get("owner"), package_data.get("repo_name")), None)
+            self._uninstall_labels.pop(package_id, None)
             await self.async_save_packages()
             self.async_update_listeners()
 
@@ -1,179 +1,199 @@
 from __future__ import annotations
 
+import base64
 import logging
+import time
+from typing import Any
 
+import aiohttp
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds to remember README and icon probe results per repo
+_PROBE_CACHE_TTL = 900
+
+# Shared request timeouts, built once instead of per call
+_TIMEOUT_SHORT = aiohttp.ClientTimeout(total=10)
+_TIMEOUT_DEFAULT = aiohttp.ClientTimeout(total=30)
+_TIMEOUT_LONG = aiohttp.ClientTimeout(total=60)
+
+
+# Returned by get_latest_release_if_changed when the release is unchanged
+NOT_MODIFIED = object()
+
+
+class GiteaAPIError(RuntimeError):
+    """Raised when the Gitea API answers with an unexpected status."""
+
+    def __init__(self, message: str, status: int) -> None:
+        super().__init__(message)
+        self.status = status
+
 
 class GiteaClient:
     def __init__(self, hass: HomeAssistant, base_url: str):
         self.hass = hass
         self.base_url = base_url.rstrip("/")
-
-    def _headers(self) -> dict:
-        """Get headers."""
-        return {"Accept": "application/json"}
+        self._headers_dict = {"Accept": "application/json"}
+        self._readme_cache: dict[tuple[str, str], tuple[str | None, float]] = {}
+        self._icon_cache: dict[tuple[str, str, str], tuple[str | None, float]] = {}
+
+    async def _get_json(
+        self,
+        path: str,
+        *,
+        timeout: aiohttp.ClientTimeout = _TIMEOUT_DEFAULT,
+        default: Any = None,
+        error: str | None = None,
+    ) -> Any:
+        """GET an API path and return its JSON body, or default on a non-200 response.
+
+        When error is given, a non-200 response raises GiteaAPIError instead.
+        """
+        sess = async_get_clientsession(self.hass)
+        async with sess.get(f"{self.base_url}{path}", headers=self._headers_dict, timeout=timeout) as resp:
+            if resp.status == 200:
+                return await resp.json()
+            if error is not None:
+                raise GiteaAPIError(f"{error}: {resp.status} {await resp.text()}", resp.status)
+            _LOGGER.debug("GET %s returned HTTP %s", path, resp.status)
+            return default
 
     async def get_repo(self, owner: str, repo: str) -> dict:
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/repos/{owner}/{repo}"
-        async with sess.get(url, headers=self._headers(), timeout=30) as resp:
-            if resp.status != 200:
-                raise RuntimeError(f"Repo fetch failed: {resp.status} {await resp.text()}")
-            return await resp.json()
+        return await self._get_json(f"/api/v1/repos/{owner}/{repo}", error="Repo fetch failed")
 
     async def get_org_repos(self, org: str) -> list[dict]:
         """Fetch all repositories for an organization."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/orgs/{org}/repos"
-        async with sess.get(url, headers=self._headers(), timeout=30) as resp:
-            if resp.status != 200:
-                _LOGGER.error("Failed to fetch repos for org %s: %s", org, resp.status)
-                return []
-            return await resp.json()
+        repos = await self._get_json(f"/api/v1/orgs/{org}/repos")
+        if repos is None:
+            _LOGGER.error("Failed to fetch repos for org %s", org)
+            return []
+        return repos
 
     async def get_user_repos(self, user: str) -> list[dict]:
         """Fetch all repositories for a user."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/users/{user}/repos"
-        async with sess.get(url, headers=self._headers(), timeout=30) as resp:
-            if resp.status != 200:
-                _LOGGER.error("Failed to fetch repos for user %s: %s", user, resp.status)
-                return []
-            return await resp.json()
+        repos = await self._get_json(f"/api/v1/users/{user}/repos")
+        if repos is None:
+            _LOGGER.error("Failed to fetch repos for user %s", user)
+            return []
+        return repos
 
     async def get_user_orgs(self) -> list[dict]:
         """Fetch all organizations the authenticated user belongs to."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/user/orgs"
-        async with sess.get(url, headers=self._headers(), timeout=30) as resp:
-            if resp.status != 200:
-                _LOGGER.debug("Failed to fetch user orgs: %s", resp.status)
-                return []
-            return await resp.json()
+        return await self._get_json("/api/v1/user/orgs", default=[])
 
     async def get_current_user(self) -> dict | None:
         """Fetch the authenticated user's info."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/user"
         try:
-            async with sess.get(url, headers=self._headers(), timeout=20) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+            return await self._get_json("/api/v1/user")
         except Exception as e:
             _LOGGER.debug("Failed to fetch current user: %s", e)
         return None
 
     async def get_user_following(self) -> list[dict]:
         """Fetch users that the authenticated user is following."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/user/following"
         try:
-            async with sess.get(url, headers=self._headers(), timeout=30) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+            return await self._get_json("/api/v1/user/following", default=[])
         except Exception as e:
             _LOGGER.debug("Failed to fetch following: %s", e)
         return []
 
     async def get_org_info(self, org: str) -> dict | None:
         """Fetch organization information to get display name."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/orgs/{org}"
         try:
-            async with sess.get(url, headers=self._headers(), timeout=20) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+            return await self._get_json(f"/api/v1/orgs/{org}")
         except Exception as e:
             _LOGGER.debug("Failed to fetch org info for %s: %s", org, e)
         return None
 
     async def get_org_members(self, org: str) -> list[dict]:
         """Fetch all members of an organization."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/orgs/{org}/members"
         try:
-            async with sess.get(url, headers=self._headers(), timeout=30) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+            return await self._get_json(f"/api/v1/orgs/{org}/members", default=[])
         except Exception as e:
             _LOGGER.debug("Failed to fetch org members for %s: %s", org, e)
         return []
 
     async def get_user_info(self, user: str) -> dict | None:
         """Fetch user information to get display name."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/users/{user}"
         try:
-            async with sess.get(url, headers=self._headers(), timeout=20) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+            return await self._get_json(f"/api/v1/users/{user}")
         except Exception as e:
             _LOGGER.debug("Failed to fetch user info for %s: %s", user, e)
         return None
 
     async def get_releases(self, owner: str, repo: str) -> list[dict]:
         """Fetch all releases for a repository."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/repos/{owner}/{repo}/releases"
         try:
-            async with sess.get(url, headers=self._headers(), timeout=30) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+            return await self._get_json(f"/api/v1/repos/{owner}/{repo}/releases", default=[])
         except Exception as e:
             _LOGGER.debug("Failed to fetch releases for %s/%s: %s", owner, repo, e)
         return []
 
     async def get_file_content(self, owner: str, repo: str, file_path: str, branch: str = "main") -> str | None:
         """Fetch content of a specific file."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/repos/{owner}/{repo}/contents/{file_path}?ref={branch}"
         try:
-            async with sess.get(url, headers=self._headers(), timeout=20) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    import base64
-                    content = base64.b64decode(data["content"]).decode("utf-8")
-                    return content
+            data = await self._get_json(f"/api/v1/repos/{owner}/{repo}/contents/{file_path}?ref={branch}")
+            if data is not None:
+                content = base64.b64decode(data["content"]).decode("utf-8")
+                return content
         except Exception:
             pass
         return None
 
     async def get_readme(self, owner: str, repo: str) -> str | None:
         """Fetch the README content for a repository."""
-        sess = async_get_clientsession(self.hass)
+        key = (owner, repo)
+        now = time.monotonic()
+        hit = self._readme_cache.get(key)
+        if hit and hit[1] > now:
+            return hit[0]
+
+        content = await self._fetch_readme(owner, repo)
+        self._readme_cache[key] = (content, now + _PROBE_CACHE_TTL)
+        return content
+
+    async def _fetch_readme(self, owner: str, repo: str) -> str | None:
+        """Fetch the README content, trying the common file names."""
         # Try README.md, then readme.md, then README
         for name in ["README.md", "readme.md", "README"]:
-            url = f"{self.base_url}/api/v1/repos/{owner}/{repo}/contents/{name}"
             try:
-                async with sess.get(url, headers=self._headers(), timeout=20) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        import base64
-                        content = base64.b64decode(data["content"]).decode("utf-8")
-                        return content
+                data = await self._get_json(f"/api/v1/repos/{owner}/{repo}/contents/{name}")
+                if data is not None:
+                    content = base64.b64decode(data["content"]).decode("utf-8")
+                    return content
             except Exception:
                 continue
         return None
 
     async def get_latest_release(self, owner: str, repo: str) -> dict:
+        return await self._get_json(
+            f"/api/v1/repos/{owner}/{repo}/releases/latest", error="Latest release fetch failed"
+        )
+
+    async def get_latest_release_if_changed(
+        self, owner: str, repo: str, etag: str | None = None
+    ) -> tuple[Any, str | None]:
+        """Fetch the latest release unless it still matches etag.
+
+        Returns (release, etag), or (NOT_MODIFIED, etag) when the server answers 304.
+        """
+        headers = {**self._headers_dict, "If-None-Match": etag} if etag else self._headers_dict
         sess = async_get_clientsession(self.hass)
         url = f"{self.base_url}/api/v1/repos/{owner}/{repo}/releases/latest"
-        async with sess.get(url, headers=self._headers(), timeout=30) as resp:
+        async with sess.get(url, headers=headers, timeout=_TIMEOUT_DEFAULT) as resp:
+            if resp.status == 304:
+                return NOT_MODIFIED, etag
             if resp.status != 200:
-                raise RuntimeError(f"Latest release fetch failed: {resp.status} {await resp.text()}")
-            return await resp.json()
+                raise GiteaAPIError(f"Latest release fetch failed: {resp.status} {await resp.text()}", resp.status)
+            return await resp.json(), resp.headers.get("ETag")
 
     async def get_release_by_tag(self, owner: str, repo: str, tag: str) -> dict:
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/repos/{owner}/{repo}/releases/tags/{tag}"
-        async with sess.get(url, headers=self._headers(), timeout=30) as resp:
-            if resp.status != 200:
-                raise RuntimeError(f"Release-by-tag fetch failed: {resp.status} {await resp.text()}")
-            return await resp.json()
+        return await self._get_json(
+            f"/api/v1/repos/{owner}/{repo}/releases/tags/{tag}", error="Release-by-tag fetch failed"
+        )
 
     def pick_asset(self, release: dict, asset_name: str | None = None) -> dict:
         assets = release.get("assets") or []
@@ -187,9 +207,16 @@ class GiteaClient:
             raise RuntimeError(f"Asset '{asset_name}' not found in release assets.")
 
         # Prefer a single .zip
-        zips = [a for a in assets if (a.get("name") or "").lower().endswith(".zip")]
-        if len(zips) == 1:
-            return zips[0]
+        first_zip = None
+        zip_count = 0
+        for a in assets:
+            if (a.get("name") or "")[-4:].lower() == ".zip":
+                zip_count += 1
+                if zip_count > 1:
+                    break
+                first_zip = a
+        if zip_count == 1:
+            return first_zip
 
         if len(assets) == 1:
             return assets[0]
@@ -203,23 +230,31 @@ class GiteaClient:
 
     async def search_repos(self, limit: int = 100) -> list[dict]:
         """Search for all accessible repositories."""
-        sess = async_get_clientsession(self.hass)
-        url = f"{self.base_url}/api/v1/repos/search?limit={limit}"
         try:
-            async with sess.get(url, headers=self._headers(), timeout=60) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    # The search API returns {"ok": true, "data": [...repos...]}
-                    if isinstance(data, dict) and "data" in data:
-                        return data["data"]
-                    elif isinstance(data, list):
-                        return data
+            data = await self._get_json(f"/api/v1/repos/search?limit={limit}", timeout=_TIMEOUT_LONG)
+            # The search API returns {"ok": true, "data": [...repos...]}
+            if isinstance(data, dict) and "data" in data:
+                return data["data"]
+            elif isinstance(data, list):
+                return data
         except Exception as e:
             _LOGGER.debug("Failed to search repos: %s", e)
         return []
 
     async def get_icon_url(self, owner: str, repo: str, branch: str = "main") -> str | None:
         """Get the URL for the repo's icon if it exists."""
+        key = (owner, repo, branch)
+        now = time.monotonic()
+        hit = self._icon_cache.get(key)
+        if hit and hit[1] > now:
+            return hit[0]
+
+        icon_url = await self._probe_icon_url(owner, repo, branch)
+        self._icon_cache[key] = (icon_url, now + _PROBE_CACHE_TTL)
+        return icon_url
+
+    async def _probe_icon_url(self, owner: str, repo: str, branch: str) -> str | None:
+        """Probe the common icon paths of a repo."""
         sess = async_get_clientsession(self.hass)
         # Try different icon paths
         icon_paths = [
@@ -231,12 +266,12 @@ class GiteaClient:
         ]
 
         for path in icon_paths:
-            url = f"{self.base_url}/api/v1/repos/{owner}/{repo}/contents/{path}?ref={branch}"
+            # HEAD the raw download URL so no icon content is transferred
+            url = f"{self.base_url}/{owner}/{repo}/raw/branch/{branch}/{path}"
             try:
-                async with sess.get(url, headers=self._headers(), timeout=10) as resp:
+                async with sess.head(url, timeout=_TIMEOUT_SHORT, allow_redirects=True) as resp:
                     if resp.status == 200:
-                        # Return the raw download URL
-                        return f"{self.base_url}/{owner}/{repo}/raw/branch/{branch}/{path}"
+                        return url
             except Exception:
                 continue
 
@@ -252,16 +287,11 @@ class GiteaClient:
 
         Returns a list of entries with keys like: name, path, type ('file'/'dir').
         """
-        sess = async_get_clientsession(self.hass)
         p = path.strip("/")
 
-        url = f"{self.base_url}/api/v1/repos/{owner}/{repo}/contents/{p}?ref={branch}"
         try:
-            async with sess.get(url, headers=self._headers(), timeout=15) as resp:
-                if resp.status != 200:
-                    return []
-                data = await resp.json()
-                return data if isinstance(data, list) else []
+            data = await self._get_json(f"/api/v1/repos/{owner}/{repo}/contents/{p}?ref={branch}", timeout=_TIMEOUT_SHORT)
+            return data if isinstance(data, list) else []
         except Exception:
             return []
 
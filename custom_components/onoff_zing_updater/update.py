@@ -109,23 +109,16 @@ class PackageUpdateEntity(UpdateEntity):
 
     async def async_release_notes(self) -> str | None:
         """Return the release notes."""
-        pkg = self.coordinator.packages.get(self.package_id, {})
-        notes = pkg.get("release_notes")
-
-        if notes:
-            return notes
-
         try:
-            owner = pkg.get("owner")
-            repo = pkg.get("repo_name")
-            if owner and repo:
-                release = await self.coordinator.client.get_latest_release(owner, repo)
-                if release:
-                    return release.get("body", "No release notes available.")
+            notes = await self.coordinator.async_get_release_notes(self.package_id)
+            if notes:
+                return notes
         except Exception as e:
             _LOGGER.debug("Failed to fetch release notes: %s", e)
 
-        return "No release notes available."
+        # Fall back to the preview kept from the last update check
+        pkg = self.coordinator.packages.get(self.package_id, {})
+        return pkg.get("release_notes") or "No release notes available."
 
     async def async_install(
         self, version: str | None, backup: bool, **kwargs: Any